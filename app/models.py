@@ -2,17 +2,24 @@
 Data models for validation and documentation.
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from pydantic import SkipValidation
+from typing import List, Optional, Any
+from datetime import datetime
 
 class Question(BaseModel):
     """Model for a question"""
     text: str = Field(..., description="The question text")
 
 class MessageContent(BaseModel):
-    """Model for WebSocket message content"""
+    """
+    Model for WebSocket message content.
+
+    Documents the frame shape only. The interview WebSocket checks incoming
+    frames at the boundary (a dict with a "type" key) and passes them on as
+    plain dicts; use model_construct() if a typed object is ever needed.
+    """
     type: str = Field(..., description="Message type (audio/text)")
-    content: str = Field(..., description="Message content (base64 audio or text)")
+    content: Optional[str] = Field(None, description="Message content (text)")
+    hasAudio: Optional[bool] = Field(None, description="Whether audio was recorded (for audio)")
     voiceStyle: Optional[str] = Field(None, description="Voice style for response")
     transcription: Optional[str] = Field(None, description="Speech transcription (for audio)")
 
@@ -20,19 +27,20 @@ class HistoryEntry(BaseModel):
     """Model for interview history entry"""
     role: str = Field(..., description="Message role (user/assistant/system)")
     content: str = Field(..., description="Message content")
-    rating: Optional[float] = Field(None, description="Rating (for user responses)")
+    rating: Optional[float] = Field(None, description="Rating (for user responses, filled in once rated)")
+    question_index: Optional[int] = Field(None, description="Index of the answered question (for user responses)")
     final: Optional[bool] = Field(None, description="Whether this is the final message")
 
 class InterviewData(BaseModel):
     """Model for interview data"""
     interview_id: str = Field(..., description="Unique interview ID")
     questions: List[str] = Field(..., description="List of interview questions")
-    history: List[Dict[str, SkipValidation[Any]]] = Field(default_factory=list, description="Interview history")
+    history: Any = Field(default_factory=list, description="Interview history (list of message dicts)")
     question_index: int = Field(0, description="Current question index")
     job_description: str = Field(..., description="Job description")
     resume_summary: str = Field(..., description="Summary of candidate's resume")
     summary: Optional[str] = Field(None, description="Interview summary")
-    created_at: Optional[float] = Field(None, description="Creation timestamp")
+    created_at: Optional[datetime] = Field(None, description="Creation time (UTC)")
 
 class InterviewResponse(BaseModel):
     """Model for interview creation response"""
@@ -41,7 +49,7 @@ class InterviewResponse(BaseModel):
 
 class InsightsResponse(BaseModel):
     """Model for interview insights response"""
-    transcript: List[Dict[str, SkipValidation[Any]]] = Field(..., description="Interview transcript")
+    transcript: Any = Field(..., description="Interview transcript (list of message dicts)")
     questions: List[str] = Field(..., description="Interview questions")
     summary: str = Field(..., description="Interview summary")
-    candidate_details: Optional[Dict[str, SkipValidation[Any]]] = Field(None, description="Candidate details")
+    candidate_details: Any = Field(None, description="Candidate details")
@@ -1,48 +1,126 @@
-import json
-import base64
+import os
 import logging
 import asyncio  # Add this import for asyncio.create_task()
 import time  # Add this import
-from fastapi import APIRouter, UploadFile, File, Form, WebSocket, HTTPException, Request
-from fastapi.responses import HTMLResponse, FileResponse
-from app.services import get_db, get_collection
+import orjson
+from fastapi import APIRouter, UploadFile, File, Form, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi.responses import HTMLResponse, FileResponse, Response, StreamingResponse
+from app.services import get_db, get_collection, list_collection_names, check_service_health
 
 from app.services.interview import (
     create_interview, 
-    get_interview_data, 
+    get_interview_state, 
     process_interview_response, 
-    generate_interview_insights
+    generate_interview_insights,
+    stream_interview_summary
 )
 from app.services.pdf import extract_text_from_pdf
-from app.services.audio import generate_audio
-from app.utils import format_question
+from app.services.audio import generate_audio, DEFAULT_VOICE
+from app.utils import format_question, LRUCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Serialized insights of finished interviews, keyed by (interview_id, version)
+_insights_cache = LRUCache(maxsize=512)
+# Statuses after which insights only change through /update-candidate/
+_FINAL_STATUSES = ("completed", "completed_with_errors")
+
+async def _receive_frame(websocket: WebSocket):
+    """Receive one WebSocket frame as raw bytes or text (clients may send either)"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        return message["bytes"]
+    return message.get("text") or ""
+
+# Largest client frame the interview loop will parse (also passed to uvicorn)
+WS_MAX_BODY = 512 * 1024
+
+# Window for coalescing outbound JSON messages into a single frame
+_FLUSH_WINDOW = 0.005
+# Queue sentinel that stops the flusher once earlier frames are sent
+_CLOSE = object()
+
+def _queue_message(outbound: asyncio.Queue, message: dict, audio: bytes = None):
+    """
+    Queue a message for the client using the two-frame protocol.
+
+    Every message goes out as JSON text carrying a "hasAudio" flag. When
+    audio is present it follows immediately as a binary frame holding the
+    raw MP3 bytes, so binary frames are reserved for audio only.
+    """
+    message["hasAudio"] = bool(audio)
+    outbound.put_nowait(orjson.dumps(message).decode())
+    if audio:
+        outbound.put_nowait(audio)
+
+def _system_frame(content):
+    """Serialize a system message once, in the same shape _queue_message produces"""
+    return orjson.dumps({"role": "system", "content": content, "hasAudio": False}).decode()
+
+# Constant replies, serialized once at import and queued as-is
+_INVALID_FORMAT_FRAME = _system_frame("Invalid message format. Please try again.")
+_TOO_LARGE_FRAME = _system_frame("Message too large. Please send a shorter response.")
+
+async def _flush_outbound(websocket: WebSocket, outbound: asyncio.Queue):
+    """
+    Send queued frames in order.
+
+    JSON messages queued within _FLUSH_WINDOW of each other are coalesced
+    into one text frame holding a JSON array; a lone message is sent as a
+    plain object. Audio bytes always go out as their own binary frame.
+    """
+    pending = None
+    while True:
+        item = pending if pending is not None else await outbound.get()
+        pending = None
+        if item is _CLOSE:
+            return
+        if isinstance(item, bytes):
+            await websocket.send_bytes(item)
+            continue
+        
+        batch = [item]
+        while True:
+            try:
+                async with asyncio.timeout(_FLUSH_WINDOW):
+                    pending = await outbound.get()
+            except TimeoutError:
+                pending = None
+                break
+            if not isinstance(pending, str):
+                break
+            batch.append(pending)
+            pending = None
+        
+        await websocket.send_text(batch[0] if len(batch) == 1 else f"[{','.join(batch)}]")
+
+def _load_page(path):
+    """Read a static HTML page once at import so missing files fail fast"""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        logger.error(f"Frontend HTML file not found: {path}")
+        raise
+
+# Static pages are served from memory instead of being re-read per request
+_INDEX_HTML = _load_page("static/index.html")
+_INSIGHTS_HTML = _load_page("static/insights.html")
+
 # Serve homepage
 @router.get("/", response_class=HTMLResponse)
 async def get_homepage():
-    try:
-        with open("static/index.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(f.read())
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Frontend HTML file not found")
-    except UnicodeDecodeError as e:
-        raise HTTPException(status_code=500, detail=f"Encoding error: {str(e)}")
+    return HTMLResponse(_INDEX_HTML)
 
 # Serve insights page
 @router.get("/insights.html", response_class=HTMLResponse)
 async def get_insights_page():
-    try:
-        with open("static/insights.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(f.read())
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Insights HTML file not found")
-    except UnicodeDecodeError as e:
-        raise HTTPException(status_code=500, detail=f"Encoding error: {str(e)}")
+    return HTMLResponse(_INSIGHTS_HTML)
 
 # Upload and parse resume endpoint
 @router.post("/upload-resume/")
@@ -51,15 +129,17 @@ async def upload_resume(resume: UploadFile = File(...), job_description: str = F
     if not resume.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
+    # Check the size without reading the upload into memory
+    size = resume.size
+    if size is None:
+        size = resume.file.seek(0, os.SEEK_END)
+        resume.file.seek(0)
+    if not size:
+        raise HTTPException(status_code=400, detail="Empty PDF file received")
+
     try:
-        # Read the PDF content properly
-        pdf_content = await resume.read()
-        
-        if not pdf_content:
-            raise HTTPException(status_code=400, detail="Empty PDF file received")
-            
-        # Extract text from PDF using our service
-        resume_text = await extract_text_from_pdf(pdf_content)
+        # Parse straight from the spooled upload file instead of a bytes copy
+        resume_text = await extract_text_from_pdf(resume.file)
         
         if not resume_text or not resume_text.strip():
             raise HTTPException(
@@ -82,32 +162,36 @@ async def upload_resume(resume: UploadFile = File(...), job_description: str = F
 # WebSocket endpoint for interview
 @router.websocket("/interview/{interview_id}")
 async def interview_websocket(websocket: WebSocket, interview_id: str):
-    print(f"\n\n***** WEBSOCKET CONNECTED: {interview_id} *****\n\n")
     await websocket.accept()
     
+    # All outbound frames go through one queue so they can be coalesced
+    outbound = asyncio.Queue()
+    flusher = asyncio.create_task(_flush_outbound(websocket, outbound))
+    
     try:
         # Initialize the interview session
-        interview_data = await get_interview_data(interview_id)
-        if not interview_data:
-            logger.error(f"Invalid interview ID: {interview_id}")
+        interview_state = await get_interview_state(interview_id)
+        if not interview_state:
+            logger.error("Invalid interview ID: %s", interview_id)
             await websocket.close(code=1008, reason="Invalid interview ID")
             return
 
         # Send first question
-        question_index = interview_data["question_index"]
-        questions = interview_data["questions"]
+        question_index = interview_state.question_index
+        questions = interview_state.questions
         
-        logger.info(f"Starting interview {interview_id}. Questions: {len(questions)}")
-        logger.info(f"Current question index: {question_index}")
+        logger.info("Starting interview %s. Questions: %d", interview_id, len(questions))
+        logger.info("Current question index: %d", question_index)
         
         if question_index < len(questions):
             current_question = questions[question_index]
             # Default voice for initial greeting
-            default_voice = "Callum"
-            logger.info(f"⭐ Starting interview {interview_id} with default voice: {default_voice}")
-            logger.info(f"⭐ Sending first question: {current_question}")
+            default_voice = DEFAULT_VOICE
+            logger.info("⭐ Starting interview %s with default voice: %s", interview_id, default_voice)
+            logger.info("⭐ Sending first question: %s", current_question)
             
-            # Start audio generation - EXPLICITLY set it as a background task
+            # Start audio generation - EXPLICITLY set it as a background task.
+            # Usually served from the cache warmed by create_interview.
             audio_task = asyncio.create_task(generate_audio(current_question, voice_name=default_voice))
             
             # First, update the interview history immediately
@@ -120,47 +204,39 @@ async def interview_websocket(websocket: WebSocket, interview_id: str):
             # Prepare the response message
             message = {
                 "role": "assistant",
-                "content": current_question,
-                "audio": ""  # Default empty audio
+                "content": current_question
             }
+            audio_bytes = None
             
             # Wait for audio with a timeout
             audio_start_time = time.time()
             try:
                 # IMPROVED: Reduce timeout to fail faster when there are issues
-                audio_bytes = await asyncio.wait_for(audio_task, timeout=8.0)
+                async with asyncio.timeout(8.0):
+                    audio_bytes = await audio_task
                 if audio_bytes:
-                    # Explicitly handle the base64 encoding in a try/except block
-                    try:
-                        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-                        audio_size = len(audio_base64)
-                        message["audio"] = audio_base64
-                        logger.info(f"✅ Successfully generated audio for first question: {audio_size} bytes in {time.time() - audio_start_time:.2f} seconds")
-                    except Exception as e:
-                        logger.error(f"❌ Error encoding audio to base64: {str(e)}")
+                    logger.info("✅ Successfully generated audio for first question: %d bytes in %.2f seconds",
+                                len(audio_bytes), time.time() - audio_start_time)
                 else:
                     logger.warning("⚠️ Audio generation returned None for first question")
-            except asyncio.TimeoutError:
-                logger.warning(f"⚠️ Audio generation timed out after {time.time() - audio_start_time:.2f} seconds")
+            except TimeoutError:
+                logger.warning("⚠️ Audio generation timed out after %.2f seconds", time.time() - audio_start_time)
             except Exception as e:
-                logger.error(f"❌ Error in audio generation for first question: {str(e)}", exc_info=True)
+                logger.error("❌ Error in audio generation for first question: %s", e, exc_info=True)
             
             # IMPORTANT: Verify audio data before sending
-            if message["audio"]:
-                logger.info(f"🎵 Including audio in message: {len(message['audio'])} bytes")
+            if audio_bytes:
+                logger.info("🎵 Sending audio as binary frame: %d bytes", len(audio_bytes))
             else:
                 logger.warning("⚠️ No audio in message, sending text only")
                 
-            # Log the full message content
-            logger.info(f"📤 Sending message with audio: {'Yes' if message['audio'] else 'No'}")
-            
-            # Send the message, ensuring it's properly JSON serialized
-            response_json = json.dumps(message)
-            logger.info(f"📤 Sending question to client: {message['content'][:50]}... (JSON length: {len(response_json)} bytes)")
-            await websocket.send_text(response_json)
+            # Send the question as a JSON frame, followed by the audio frame if any
+            logger.info("📤 Sending question to client: %.50s...", current_question)
+            _queue_message(outbound, message, audio_bytes)
             
         else:
-            logger.warning(f"Interview {interview_id} already completed (question_index={question_index}, questions={len(questions)})")
+            logger.warning("Interview %s already completed (question_index=%d, questions=%d)",
+                           interview_id, question_index, len(questions))
             await websocket.close(code=1000, reason="Interview already completed")
             return
 
@@ -168,18 +244,32 @@ async def interview_websocket(websocket: WebSocket, interview_id: str):
         while True:
             # Process user responses 
             try:
-                data = await websocket.receive_text()
-                logger.info(f"Received WebSocket message length: {len(data)}")
-                logger.info(f"Received WebSocket message preview: {data[:100]}...")
+                data = await _receive_frame(websocket)
+                logger.info("Received WebSocket message length: %d", len(data))
+                logger.info("Received WebSocket message preview: %.100s...", data)
+                
+                # Refuse oversized frames before spending any time parsing them
+                if len(data) > WS_MAX_BODY:
+                    logger.warning("Rejected WebSocket message of %d bytes (limit %d)", len(data), WS_MAX_BODY)
+                    outbound.put_nowait(_TOO_LARGE_FRAME)
+                    continue
                 
                 try:
-                    parsed_data = json.loads(data)
+                    parsed_data = orjson.loads(data)
+                    
+                    # Boundary check only: frames are plain dicts with a "type" and
+                    # optional "content"/"hasAudio"/"voiceStyle"/"transcription" keys (the
+                    # MessageContent shape), never validated into a model per frame
+                    if not isinstance(parsed_data, dict) or "type" not in parsed_data:
+                        outbound.put_nowait(_INVALID_FORMAT_FRAME)
+                        continue
+                    _get = parsed_data.get
                     
                     # Make sure voiceStyle is only used for questions, not responses
-                    if parsed_data.get("type") == "text" or parsed_data.get("type") == "audio":
+                    message_type = _get("type")
+                    if message_type == "text" or message_type == "audio":
                         # Preserve voice style only for question generation
-                        voice_style = parsed_data.get("voiceStyle")
-                        logger.info(f"Using voice style '{voice_style}' for next question (not responses)")
+                        logger.info("Using voice style '%s' for next question (not responses)", _get("voiceStyle"))
                     
                     # Process the user's response and get the next question/response
                     response = await process_interview_response(
@@ -189,67 +279,108 @@ async def interview_websocket(websocket: WebSocket, interview_id: str):
                     
                     # If we have a response, send it back
                     if response:
-                        logger.info(f"Sending response back to client: {response.get('content', '')[:50]}...")
-                        await websocket.send_text(json.dumps(response))
+                        logger.info("Sending response back to client: %.50s...", response.get("content", ""))
+                        # Raw audio goes out as its own binary frame
+                        _queue_message(outbound, response, response.pop("audio", None))
                         
-                        # If interview is complete, close the connection
+                        # If interview is complete, flush pending frames and close the connection
                         if response.get("interviewComplete"):
+                            outbound.put_nowait(_CLOSE)
+                            await flusher
                             await websocket.close(code=1000)
                             break
                     else:
                         logger.warning("No response returned from process_interview_response")
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {str(e)}")
-                    await websocket.send_text(json.dumps({
-                        "role": "system",
-                        "content": "Invalid message format. Please try again."
-                    }))
+                except orjson.JSONDecodeError as e:
+                    logger.error("JSON decode error: %s", e)
+                    outbound.put_nowait(_INVALID_FORMAT_FRAME)
+            except WebSocketDisconnect:
+                logger.info("Client disconnected from interview %s", interview_id)
+                break
             except Exception as e:
-                logger.error(f"Error in WebSocket loop: {str(e)}", exc_info=True)
+                logger.error("Error in WebSocket loop: %s", e, exc_info=True)
                 try:
-                    await websocket.send_text(json.dumps({
-                        "role": "system",
-                        "content": f"An error occurred: {str(e)}"
-                    }))
+                    # Only the first line of the error goes to the client
+                    error_text = str(e).partition("\n")[0]
+                    outbound.put_nowait(_system_frame(f"An error occurred: {error_text}"))
                 except:
                     logger.error("Failed to send error message to client")
 
     except Exception as e:
-        logger.error(f"WebSocket error: {str(e)}", exc_info=True)
+        logger.error("WebSocket error: %s", e, exc_info=True)
         try:
             await websocket.close(code=1011, reason=f"Error: {str(e)}")
         except:
             pass
+    finally:
+        if not flusher.done():
+            flusher.cancel()
 
 # Insights endpoint
 @router.get("/insights/{interview_id}")
 async def get_insights(interview_id: str):
-    insights = await generate_interview_insights(interview_id)
-    if not insights:
+    # Cheap version probe so finished interviews are served from the cache
+    interviews = get_collection('interviews')
+    version_doc = await interviews.find_one({"interview_id": interview_id}, {"version": 1, "_id": 0})
+    if version_doc is None:
         raise HTTPException(status_code=404, detail="Interview not found")
     
+    cache_key = (interview_id, version_doc.get("version", 0))
+    body = _insights_cache.get(cache_key)
+    if body is None:
+        insights = await generate_interview_insights(interview_id)
+        if not insights:
+            raise HTTPException(status_code=404, detail="Interview not found")
+        
+        # Serialize once; finished interviews are cached until their version changes
+        body = orjson.dumps(insights)
+        if insights["candidate_details"].get("status") in _FINAL_STATUSES:
+            _insights_cache[cache_key] = body
+    
     # Log successful insights retrieval
     logger.info(f"Retrieved insights for interview: {interview_id}")
-    return insights
+    return Response(content=body, media_type="application/json")
+
+# Streamed summary endpoint, so the UI can show text while Gemini writes it
+@router.get("/insights/{interview_id}/summary-stream")
+async def get_summary_stream(interview_id: str):
+    chunks = await stream_interview_summary(interview_id)
+    if chunks is None:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return StreamingResponse(chunks, media_type="text/plain; charset=utf-8")
 
 # Add a new endpoint to support candidate details update
 @router.post("/update-candidate/{interview_id}")
 async def update_candidate_details(interview_id: str, details: dict):
+    # Untrusted construction site: details is parsed from the request body
+    # Keys become dotted field paths, so reject anything Mongo would interpret
+    if any(not isinstance(key, str) or not key or key.startswith("$") or "." in key for key in details):
+        raise HTTPException(status_code=400, detail="Invalid candidate detail field name")
+    
     try:
         interviews = get_collection('interviews')
         
-        # First check if interview exists
-        interview = await get_interview_data(interview_id)
-        if not interview:
-            raise HTTPException(status_code=404, detail="Interview not found")
+        # Merge the details server-side with dotted paths instead of
+        # reading the whole interview document first
+        if details:
+            result = await interviews.update_one(
+                {"interview_id": interview_id},
+                {
+                    "$set": {f"candidate_details.{key}": value for key, value in details.items()},
+                    # Invalidates cached insights for this interview
+                    "$inc": {"version": 1}
+                }
+            )
+            found = result.matched_count > 0
+        else:
+            found = await interviews.count_documents({"interview_id": interview_id}, limit=1) > 0
         
-        # Update candidate details
-        await interviews.update_one(
-            {"interview_id": interview_id},
-            {"$set": {"candidate_details": {**interview.get("candidate_details", {}), **details}}}
-        )
+        if not found:
+            raise HTTPException(status_code=404, detail="Interview not found")
         
         return {"status": "success", "message": "Candidate details updated"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating candidate details: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to update candidate details: {str(e)}")
@@ -257,16 +388,14 @@ async def update_candidate_details(interview_id: str, details: dict):
 # Health check endpoint
 @router.get("/health")
 async def health_check():
-    from app.services import check_service_health
     return await check_service_health()
 
 # Debug route for logging WebSocket issues
 @router.get("/debug-info")
 async def debug_info():
     """Debug endpoint to check current system state"""
-    from app.services import _collections
     return {
-        "collections": list(_collections.keys()),
+        "collections": list_collection_names(),
         "websocket_stats": {
             "active_connections": getattr(interview_websocket, "_active_connections", "N/A"),
         }
@@ -2,16 +2,19 @@
 Services package initialization.
 Initializes all services and provides health check functionality.
 """
+import os
 import logging
 import datetime
+from functools import lru_cache
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import InvalidName
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Database connection instance
 _db = None
-_collections = {}  # Cache for database collections
+_collections = {}  # Collections fetched so far, by name (for diagnostics)
 _gemini_initialized_globally = False
 
 def init_services(db_instance: AsyncIOMotorDatabase, gemini_initialized=False):
@@ -26,9 +29,13 @@ def init_services(db_instance: AsyncIOMotorDatabase, gemini_initialized=False):
     
     # Initialize and validate required collections
     try:
+        # Drop collections cached from a previous database instance
+        _get_collection.cache_clear()
+        _collections.clear()
+        
         # Ensure the 'interviews' collection exists by accessing it
         # This will create it if it doesn't exist
-        _collections['interviews'] = _db.interviews
+        _get_collection('interviews')
         logger.info("Services initialized successfully with database connection")
         
         # Initialize Gemini Live API only if not already initialized
@@ -57,20 +64,54 @@ def get_db():
 
 def get_collection(name):
     """Get a specific database collection with error handling"""
+    return _get_collection(name)
+
+@lru_cache(maxsize=32)
+def _get_collection(name):
+    """Look up a collection once; later calls are served by lru_cache"""
     db = get_db()
-    
-    # Return from cache if available
-    if name in _collections:
-        return _collections[name]
-        
-    # Otherwise get the collection and cache it
     try:
-        collection = getattr(db, name)
-        _collections[name] = collection
-        return collection
-    except AttributeError:
+        collection = db[name]
+    except InvalidName:
         logger.error(f"Collection '{name}' does not exist in the database")
         raise ValueError(f"Collection '{name}' does not exist in the database")
+    _collections[name] = collection
+    return collection
+
+def list_collection_names():
+    """Get the names of the collections cached so far"""
+    return list(_collections)
+
+async def ensure_indexes():
+    """Create the indexes the request paths rely on (idempotent)"""
+    interviews = get_collection('interviews')
+    # Every interview query and update filters on interview_id
+    await interviews.create_index("interview_id", unique=True)
+    
+    # Let Mongo drop old interviews (INTERVIEW_TTL_DAYS, default 30; 0 keeps them)
+    ttl_days = int(os.getenv("INTERVIEW_TTL_DAYS", "30"))
+    if ttl_days > 0:
+        await interviews.create_index("created_at", expireAfterSeconds=ttl_days * 24 * 60 * 60)
+
+async def warm_up_services():
+    """Open database connections and build shared clients before the first request"""
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logger.error(f"Failed to create database indexes: {str(e)}")
+    
+    try:
+        # Force a round trip so the connection pool is populated
+        await get_collection('interviews').find_one({}, projection={"_id": 1})
+        logger.info("MongoDB connection pool warmed up")
+    except Exception as e:
+        logger.error(f"Failed to warm up MongoDB connection: {str(e)}")
+    
+    try:
+        from app.services.audio import get_gemini_tts_model
+        get_gemini_tts_model()
+    except Exception as e:
+        logger.error(f"Failed to create Gemini TTS model: {str(e)}")
 
 async def check_service_health():
     """Perform health checks on all services"""
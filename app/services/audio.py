@@ -4,26 +4,53 @@ Fast audio generation service using Gemini Multimodal API.
 import io
 import os
 import asyncio
-import base64
+import hashlib
 import logging
-from google import generativeai as genai
-from pydub import AudioSegment
-from gtts import gTTS
+from concurrent.futures import ThreadPoolExecutor
+from app.utils import LRUCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Cache for generated audio
-audio_cache = {}
+# Bounded in-memory cache for generated audio, keyed by _audio_cache_key()
+audio_cache = LRUCache(maxsize=512)
+
+# In-flight synthesis tasks, so concurrent requests for the same audio share one call
+_pending_audio = {}
+
+# Caps concurrent TTS calls so bursts queue here instead of piling onto the upstream
+_TTS_SEM = asyncio.Semaphore(16)
+
+# Long-lived worker threads for blocking TTS calls, sized to the semaphore so
+# synthesis never competes with other to_thread work for the default pool
+_tts_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="tts")
+
+# How long gTTS runs alone before Gemini is started alongside it
+_GEMINI_HEDGE_DELAY = 0.5
+
+# Voice used for the first question, before the candidate picks a style
+DEFAULT_VOICE = "Callum"
 
 # Initialize Gemini API
 def init_gemini():
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("GEMINI_API_KEY not set")
-    genai.configure(api_key=api_key)
+    from google import generativeai as genai
+    genai.configure(api_key=api_key, transport="grpc")
     return True
 
+# Gemini TTS fallback model, created once by get_gemini_tts_model()
+_gemini_tts_model = None
+
+def get_gemini_tts_model():
+    """Get the shared Gemini model used for fallback TTS"""
+    global _gemini_tts_model
+    if _gemini_tts_model is None:
+        from google import generativeai as genai
+        _gemini_tts_model = genai.GenerativeModel('gemini-1.5-flash')
+    return _gemini_tts_model
+
 # Voice mapping
 VOICE_MAPPING = {
     "Nova": "en-US-Neural2-F",
@@ -35,36 +62,108 @@ VOICE_MAPPING = {
 
 async def generate_audio(text, voice_name=None):
     """Fast audio generation with caching and fallback"""
+    # Whitespace differences do not change the speech, so they should not
+    # cause cache misses either
+    text = " ".join(text.split()) if text else text
     if not text:
         return None
         
     # Check cache first
-    cache_key = f"{text}:{voice_name or 'default'}"
-    if cache_key in audio_cache:
+    cache_key = _audio_cache_key(text, voice_name)
+    audio_data = audio_cache.get(cache_key)
+    if audio_data is not None:
         logger.info("Using cached audio")
-        return audio_cache[cache_key]
+        return audio_data
     
-    # Try primary TTS method (gTTS - fast and reliable)
-    try:
-        audio_data = await generate_audio_gtts(text, voice_name)
-        if audio_data:
-            # Cache result
-            audio_cache[cache_key] = audio_data
-            return audio_data
-    except Exception as e:
-        logger.warning(f"Primary TTS failed: {str(e)}")
+    # Join an in-flight synthesis of the same text (e.g. a prewarm) if any
+    task = _pending_audio.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_load_or_synthesize_audio(text, voice_name, cache_key))
+        _pending_audio[cache_key] = task
+        task.add_done_callback(lambda _: _pending_audio.pop(cache_key, None))
+    
+    # Shield so a caller timing out does not cancel synthesis for other waiters
+    return await asyncio.shield(task)
+
+def _audio_cache_key(text, voice_name):
+    """Fixed-size cache key for a text and voice"""
+    return hashlib.blake2b(f"{voice_name or 'default'}|{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+async def _load_or_synthesize_audio(text, voice_name, cache_key):
+    """Load audio from the disk cache or synthesize it, filling both cache layers"""
+    # Optional on-disk cache shared across restarts and workers
+    cache_dir = os.getenv("TTS_CACHE_DIR")
+    
+    audio_data = None
+    if cache_dir:
+        audio_data = await asyncio.to_thread(_read_disk_cache, cache_dir, cache_key)
     
-    # Try fallback with Gemini (slower but may handle more complex text)
+    if audio_data is None:
+        async with _TTS_SEM:
+            audio_data = await _synthesize_audio(text, voice_name)
+        if audio_data and cache_dir:
+            await asyncio.to_thread(_write_disk_cache, cache_dir, cache_key, audio_data)
+    
+    if audio_data:
+        audio_cache[cache_key] = audio_data
+    return audio_data
+
+def _read_disk_cache(cache_dir, cache_key):
+    """Read cached audio from disk (non-async helper)"""
     try:
-        audio_data = await generate_audio_gemini(text, voice_name)
-        if audio_data:
-            # Cache result
-            audio_cache[cache_key] = audio_data
-            return audio_data
+        with open(os.path.join(cache_dir, f"{cache_key}.mp3"), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Failed to read TTS disk cache: {str(e)}")
+        return None
+
+def _write_disk_cache(cache_dir, cache_key, audio_data):
+    """Write audio to the disk cache atomically (non-async helper)"""
+    path = os.path.join(cache_dir, f"{cache_key}.mp3")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio_data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to write TTS disk cache: {str(e)}")
+
+async def _synthesize_audio(text, voice_name):
+    """Synthesize audio with gTTS, hedging with Gemini when gTTS is slow or fails"""
+    gtts_task = asyncio.create_task(generate_audio_gtts(text, voice_name), name="gTTS")
+    gemini_task = None
+    pending = {gtts_task}
+    try:
+        # Give gTTS (fast and free) a head start before paying for Gemini
+        done, pending = await asyncio.wait(pending, timeout=_GEMINI_HEDGE_DELAY)
+        while True:
+            for task in done:
+                audio_data = _tts_result(task)
+                if audio_data:
+                    return audio_data
+            
+            # gTTS is slow or failed - race it against Gemini
+            if gemini_task is None:
+                gemini_task = asyncio.create_task(generate_audio_gemini(text, voice_name), name="Gemini")
+                pending.add(gemini_task)
+            if not pending:
+                return None
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Drop whichever attempt lost the race
+        for task in pending:
+            task.cancel()
+
+def _tts_result(task):
+    """Get the audio from a finished TTS task, logging failures"""
+    try:
+        return task.result()
     except Exception as e:
-        logger.error(f"Fallback TTS failed: {str(e)}")
-    
-    return None
+        logger.warning(f"TTS via {task.get_name()} failed: {str(e)}")
+        return None
 
 async def generate_audio_gtts(text, voice_name=None):
     """Generate audio using gTTS (fast method)"""
@@ -74,11 +173,13 @@ async def generate_audio_gtts(text, voice_name=None):
     if voice_name in ["Capella", "Callum"]:
         lang = "en-gb"
     
-    # Run TTS in thread pool to avoid blocking
-    return await asyncio.to_thread(_generate_gtts, text, lang)
+    # Run TTS in the dedicated thread pool to avoid blocking
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_tts_executor, _generate_gtts, text, lang)
     
 def _generate_gtts(text, lang):
     """Generate TTS using gTTS (non-async helper)"""
+    from gtts import gTTS
     output = io.BytesIO()
     tts = gTTS(text=text, lang=lang, slow=False)
     tts.write_to_fp(output)
@@ -87,7 +188,7 @@ def _generate_gtts(text, lang):
 
 async def generate_audio_gemini(text, voice_name=None):
     """Generate audio using Gemini as fallback"""
-    model = genai.GenerativeModel('gemini-1.5-pro')
+    model = get_gemini_tts_model()
     
     # Keep prompt simple and direct for speed
     prompt = f"Convert this text to speech: '{text}'. Return just the audio."
@@ -2,27 +2,27 @@
 Gemini AI integration service.
 """
 import re
-import json
+import orjson
+import asyncio
 import logging
-import google.generativeai as genai
+from typing import TypedDict
+from app.utils import LRUCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-async def generate_interview_questions(resume_text, job_description):
-    """
-    Generate interview questions based on resume and job description
-    
-    Args:
-        resume_text (str): The candidate's resume text
-        job_description (str): The job description
-        
-    Returns:
-        list: Generated interview questions
-    """
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
-    prompt = f"""
+# Patterns used to parse Gemini replies
+# A line that could be a question: numbered/bullet-point (group 1, without
+# the marker) or ending with '?' (group 2); JSON artifacts and markdown
+# markers are skipped
+_QUESTION_LINE_RE = re.compile(
+    r'^[ \t]*(?!\{|```)(?:(?:\d+\.|\*|-)[ \t]+(.*[^}\s])|(.*\?))[ \t\r]*$',
+    re.MULTILINE
+)
+_RATING_RE = re.compile(r'\b([1-9]|10)\b')
+
+# Prompt templates, filled in with str.format
+_QUESTIONS_PROMPT = """
     You are an expert AI interviewer for job candidates. Based on the following resume and job description:
 
     JOB DESCRIPTION:
@@ -38,43 +38,159 @@ async def generate_interview_questions(resume_text, job_description):
     Return ONLY the questions in JSON format with the key 'questions' and an array of strings.
     Example: {{"questions": ["Question 1", "Question 2", ...]}}
     """
+
+_RATING_PROMPT = """
+    You are an AI interviewer evaluating a candidate's response.
+    
+    Question: {question}
+    Candidate response: {response}
+    
+    Rate the candidate's response from 1-10 based on:
+    - Relevance to the question
+    - Clarity of communication
+    - Depth of knowledge shown
+    
+    Return ONLY a number between 1 and 10. No explanation or other text.
+    """
+
+_BATCH_RATING_PROMPT = """
+    You are an AI interviewer evaluating a candidate's responses.
+    
+    {numbered_pairs}
+    
+    Rate each candidate response from 1-10 based on:
+    - Relevance to the question
+    - Clarity of communication
+    - Depth of knowledge shown
+    
+    Return ONLY a JSON array with one number per response, in order. Example: [7, 5, 9]
+    """
+
+_TRANSITION_PROMPT = """
+    You are an AI interviewer. The candidate just answered a question about: "{prev_question}"
+    
+    The next question will be about: "{next_question}"
+    
+    Write a very brief (1 sentence) natural transition to introduce the next topic.
+    Be professional but conversational. Don't analyze their previous answer.
+    IMPORTANT: Do NOT include or repeat the full next question in your transition.
+    Just create a bridge phrase like "Let's move on to talk about..." or "Now I'd like to ask about..."
+    """
+
+_RATE_AND_TRANSITION_PROMPT = """
+    You are an AI interviewer. The candidate just answered this question: "{prev_question}"
+    
+    Candidate response: {response}
+    
+    The next question will be about: "{next_question}"
+    
+    1. Rate the candidate's response from 1-10 based on:
+    - Relevance to the question
+    - Clarity of communication
+    - Depth of knowledge shown
+    
+    2. Write a very brief (1 sentence) natural transition to introduce the next topic.
+    Be professional but conversational. Don't analyze their previous answer.
+    IMPORTANT: Do NOT include or repeat the full next question in your transition.
+    Just create a bridge phrase like "Let's move on to talk about..." or "Now I'd like to ask about..."
+    
+    Return ONLY JSON in this format: {{"rating": 7, "transition": "..."}}
+    """
+
+_SUMMARY_PROMPT = """
+    You are an expert HR professional reviewing a job interview.
+    
+    Job Description:
+    {job_description}
+    
+    Interview Summary:
+    {qa_pairs_json}
+    
+    Provide a short, actionable assessment of this candidate (150-200 words max).
+    Include strengths, areas for improvement, and overall fit for the role.
+    """
+
+# Structured-output configs: Gemini returns JSON matching the schema, so the
+# parsing below usually takes its first, cheapest path (the fallbacks stay for
+# replies that still come back malformed)
+class _QuestionsReply(TypedDict):
+    """Reply schema for generate_interview_questions"""
+    questions: list[str]
+
+class _RatingAndTransitionReply(TypedDict):
+    """Reply schema for rate_and_transition"""
+    rating: int
+    transition: str
+
+def _json_config(schema):
+    """Generation config requesting JSON output matching a schema"""
+    return {"response_mime_type": "application/json", "response_schema": schema}
+
+_QUESTIONS_CONFIG = _json_config(_QuestionsReply)
+_RATING_CONFIG = _json_config(int)
+_BATCH_RATING_CONFIG = _json_config(list[int])
+_RATING_AND_TRANSITION_CONFIG = _json_config(_RatingAndTransitionReply)
+
+# Shared text model, created on first use by _get_model()
+_model = None
+
+def _get_model():
+    """Get the shared Gemini text model"""
+    global _model
+    if _model is None:
+        # Imported lazily: the SDK pulls in protobuf and gRPC, which is slow
+        import google.generativeai as genai
+        _model = genai.GenerativeModel('gemini-2.0-flash')
+    return _model
+
+# Exact-match caches for the short, frequently repeated calls; only successful
+# Gemini replies are stored, never the fallback defaults
+_rating_cache = LRUCache(maxsize=1024)  # (question, response) -> rating
+_transition_cache = LRUCache(maxsize=1024)  # (prev_question, next_question) -> text
+
+# Caps concurrent Gemini calls issued by the batch helpers (rate limits)
+_GEMINI_BATCH_SEM = asyncio.Semaphore(8)
+
+async def generate_interview_questions(resume_text, job_description):
+    """
+    Generate interview questions based on resume and job description
+    
+    Args:
+        resume_text (str): The candidate's resume text
+        job_description (str): The job description
+        
+    Returns:
+        list: Generated interview questions
+    """
+    model = _get_model()
+    
+    prompt = _QUESTIONS_PROMPT.format(job_description=job_description, resume_text=resume_text)
     
     try:
-        response = model.generate_content(prompt)
+        response = await model.generate_content_async(prompt, generation_config=_QUESTIONS_CONFIG)
         response_text = response.text
         
         # Extract questions using multiple parsing strategies
         questions = []
         
-        # Strategy 1: Try to parse as JSON
+        # Strategy 1: Try to parse as JSON (structured output makes this the norm)
         try:
             # Clean the response text to handle potential formatting issues
             json_text = response_text.strip()
-            # If response has markdown code blocks, extract the JSON
-            json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', json_text, re.DOTALL)
-            if json_match:
-                json_text = json_match.group(1)
+            # Slice out the JSON object, dropping any markdown code fences or
+            # trailing text around it (a no-op for structured output)
+            json_text = json_text[json_text.find('{'):json_text.rfind('}') + 1]
             
-            questions_data = json.loads(json_text)
+            questions_data = orjson.loads(json_text)
             if isinstance(questions_data, dict) and "questions" in questions_data:
                 questions = questions_data["questions"]
-        except (json.JSONDecodeError, ValueError):
+        except ValueError:  # Includes orjson.JSONDecodeError
             # Strategy 2: Extract questions by identifying lines that look like questions
             if not questions:
-                lines = response_text.strip().split('\n')
-                potential_questions = []
-                
-                for line in lines:
-                    line = line.strip()
-                    # Skip empty lines, JSON artifacts, or markdown markers
-                    if not line or line.startswith('{') or line.endswith('}') or line.startswith('```'):
-                        continue
-                    
-                    # Check if line could be a question (ends with ? or numbered/bullet-point format)
-                    if line.endswith('?') or re.match(r'^(?:\d+\.|\*|\-)\s+', line):
-                        # Remove bullet points or numbering
-                        cleaned_line = re.sub(r'^(?:\d+\.|\*|\-)\s+', '', line)
-                        potential_questions.append(cleaned_line)
+                potential_questions = [
+                    match.group(1) or match.group(2)
+                    for match in _QUESTION_LINE_RE.finditer(response_text)
+                ]
                 
                 if potential_questions:
                     questions = potential_questions
@@ -82,7 +198,7 @@ async def generate_interview_questions(resume_text, job_description):
         return questions
     
     except Exception as e:
-        logger.error(f"Error generating questions with Gemini: {str(e)}")
+        logger.error("Error generating questions with Gemini: %s", e)
         # Return empty list, caller will use fallback questions
         return []
 
@@ -97,34 +213,84 @@ async def rate_response(question, response):
     Returns:
         float: Rating between 1-10
     """
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
-    rating_prompt = f"""
-    You are an AI interviewer evaluating a candidate's response.
-    
-    Question: {question}
-    Candidate response: {response}
+    cache_key = (question, response)
+    rating = _rating_cache.get(cache_key)
+    if rating is not None:
+        return rating
     
-    Rate the candidate's response from 1-10 based on:
-    - Relevance to the question
-    - Clarity of communication
-    - Depth of knowledge shown
+    model = _get_model()
     
-    Return ONLY a number between 1 and 10. No explanation or other text.
-    """
+    rating_prompt = _RATING_PROMPT.format(question=question, response=response)
     
     try:
-        rating_response = model.generate_content(rating_prompt)
+        rating_response = await model.generate_content_async(rating_prompt, generation_config=_RATING_CONFIG)
         rating_text = rating_response.text.strip()
         
-        # Extract numeric rating
-        rating_match = re.search(r'\b([1-9]|10)\b', rating_text)
-        rating = float(rating_match.group(1)) if rating_match else 5.0
+        # Extract numeric rating; the reply is usually just the number
+        try:
+            rating = min(max(float(int(rating_text)), 1.0), 10.0)
+        except ValueError:
+            rating_match = _RATING_RE.search(rating_text)
+            if not rating_match:
+                return 5.0
+            rating = float(rating_match.group(1))
+        _rating_cache[cache_key] = rating
         return rating
     except Exception as e:
-        logger.error(f"Error generating rating: {str(e)}")
+        logger.error("Error generating rating: %s", e)
         return 5.0  # Default rating if generation fails
 
+async def rate_all_responses(qa_pairs):
+    """
+    Rate several candidate responses concurrently
+    
+    Args:
+        qa_pairs (list): (question, response) tuples
+        
+    Returns:
+        list: Ratings between 1-10, in the same order as qa_pairs
+    """
+    async def _rate(question, response):
+        async with _GEMINI_BATCH_SEM:
+            return await rate_response(question, response)
+    
+    return await asyncio.gather(*(_rate(question, response) for question, response in qa_pairs))
+
+async def rate_responses_batch(qa_pairs):
+    """
+    Rate several candidate responses with a single Gemini request
+    
+    Falls back to rate_all_responses if the batched reply cannot be parsed.
+    
+    Args:
+        qa_pairs (list): (question, response) tuples
+        
+    Returns:
+        list: Ratings between 1-10, in the same order as qa_pairs
+    """
+    if len(qa_pairs) < 2:
+        return await rate_all_responses(qa_pairs)
+    
+    model = _get_model()
+    
+    numbered_pairs = "\n".join(
+        f"{i}. Question: {question}\n   Candidate response: {response}"
+        for i, (question, response) in enumerate(qa_pairs, 1)
+    )
+    batch_prompt = _BATCH_RATING_PROMPT.format(numbered_pairs=numbered_pairs)
+    
+    try:
+        batch_response = await model.generate_content_async(batch_prompt, generation_config=_BATCH_RATING_CONFIG)
+        batch_text = batch_response.text.strip()
+        ratings = orjson.loads(batch_text[batch_text.find('['):batch_text.rfind(']') + 1])
+        if len(ratings) == len(qa_pairs):
+            return [min(max(float(rating), 1.0), 10.0) for rating in ratings]
+        logger.warning("Batch rating returned %d ratings for %d responses", len(ratings), len(qa_pairs))
+    except Exception as e:
+        logger.error("Error generating batch ratings: %s", e)
+    
+    return await rate_all_responses(qa_pairs)
+
 async def generate_transition(prev_question, next_question):
     """
     Generate a natural transition between interview questions
@@ -136,57 +302,125 @@ async def generate_transition(prev_question, next_question):
     Returns:
         str: Transition text
     """
-    model = genai.GenerativeModel('gemini-2.0-flash')
+    cache_key = (prev_question, next_question)
+    transition_text = _transition_cache.get(cache_key)
+    if transition_text is not None:
+        return transition_text
     
-    transition_prompt = f"""
-    You are an AI interviewer. The candidate just answered a question about: "{prev_question}"
+    model = _get_model()
     
-    The next question will be about: "{next_question}"
-    
-    Write a very brief (1 sentence) natural transition to introduce the next topic.
-    Be professional but conversational. Don't analyze their previous answer.
-    IMPORTANT: Do NOT include or repeat the full next question in your transition.
-    Just create a bridge phrase like "Let's move on to talk about..." or "Now I'd like to ask about..."
-    """
+    transition_prompt = _TRANSITION_PROMPT.format(prev_question=prev_question, next_question=next_question)
     
     try:
-        transition_response = model.generate_content(transition_prompt)
+        transition_response = await model.generate_content_async(transition_prompt)
         transition_text = transition_response.text.strip()
+        _transition_cache[cache_key] = transition_text
         return transition_text
     except Exception as e:
-        logger.error(f"Error generating transition: {str(e)}")
+        logger.error("Error generating transition: %s", e)
         return "Let's move to the next question."  # Better default that won't duplicate
 
-async def generate_interview_summary(job_description, qa_pairs):
+async def rate_and_transition(prev_question, response, next_question):
     """
-    Generate a summary of the interview
+    Rate a candidate's response and generate the transition to the next
+    question with a single Gemini request
+    
+    Falls back to separate rate_response and generate_transition calls if
+    the combined reply cannot be parsed.
     
     Args:
-        job_description (str): The job description
-        qa_pairs (list): List of question-answer pairs with ratings
+        prev_question (str): The question that was answered
+        response (str): The candidate's response
+        next_question (str): The next question
         
     Returns:
-        str: Generated summary
+        tuple: (rating between 1-10, transition text)
     """
-    model = genai.GenerativeModel('gemini-2.0-flash')
+    rating = _rating_cache.get((prev_question, response))
+    transition_text = _transition_cache.get((prev_question, next_question))
+    if rating is not None and transition_text is not None:
+        return rating, transition_text
     
-    summary_prompt = f"""
-    You are an expert HR professional reviewing a job interview.
+    model = _get_model()
     
-    Job Description:
-    {job_description}
+    combined_prompt = _RATE_AND_TRANSITION_PROMPT.format(
+        prev_question=prev_question,
+        response=response,
+        next_question=next_question
+    )
     
-    Interview Summary:
-    {json.dumps(qa_pairs, indent=2)}
+    try:
+        combined_response = await model.generate_content_async(
+            combined_prompt,
+            generation_config=_RATING_AND_TRANSITION_CONFIG
+        )
+        combined_text = combined_response.text.strip()
+        combined_data = orjson.loads(combined_text[combined_text.find('{'):combined_text.rfind('}') + 1])
+        rating = min(max(float(combined_data["rating"]), 1.0), 10.0)
+        transition_text = combined_data["transition"].strip()
+        
+        _rating_cache[(prev_question, response)] = rating
+        _transition_cache[(prev_question, next_question)] = transition_text
+        return rating, transition_text
+    except Exception as e:
+        logger.error("Error generating rating and transition: %s", e)
     
-    Provide a short, actionable assessment of this candidate (150-200 words max).
-    Include strengths, areas for improvement, and overall fit for the role.
+    return tuple(await asyncio.gather(
+        rate_response(prev_question, response),
+        generate_transition(prev_question, next_question)
+    ))
+
+async def generate_interview_summary(job_description, qa_pairs):
     """
+    Generate a summary of the interview
+    
+    Args:
+        job_description (str): The job description
+        qa_pairs (list): List of question-answer pairs with ratings
+        
+    Returns:
+        str: Generated summary
+    """
+    model = _get_model()
     
     try:
-        summary_response = model.generate_content(summary_prompt)
+        summary_response = await model.generate_content_async(_summary_prompt(job_description, qa_pairs))
         summary = summary_response.text
         return summary
     except Exception as e:
-        logger.error(f"Error generating summary: {str(e)}")
+        logger.error("Error generating summary: %s", e)
         return "Summary generation failed. Please review the transcript manually."
+
+async def generate_interview_summary_stream(job_description, qa_pairs):
+    """
+    Generate a summary of the interview, yielding text as Gemini produces it
+    
+    Args:
+        job_description (str): The job description
+        qa_pairs (list): List of question-answer pairs with ratings
+        
+    Yields:
+        str: Chunks of the generated summary
+    """
+    model = _get_model()
+    
+    streamed = False
+    try:
+        summary_response = await model.generate_content_async(
+            _summary_prompt(job_description, qa_pairs),
+            stream=True
+        )
+        async for chunk in summary_response:
+            streamed = True
+            yield chunk.text
+    except Exception as e:
+        logger.error("Error streaming summary: %s", e)
+        if not streamed:
+            yield "Summary generation failed. Please review the transcript manually."
+
+def _summary_prompt(job_description, qa_pairs):
+    """Build the interview summary prompt"""
+    return _SUMMARY_PROMPT.format(
+        job_description=job_description,
+        qa_pairs_json=orjson.dumps(qa_pairs, option=orjson.OPT_INDENT_2).decode()
+    )
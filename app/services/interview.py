@@ -4,19 +4,21 @@ Interview management service.
 import os
 import json
 import logging
-import base64
 import asyncio
 import datetime
 import time  # Add this import
+from dataclasses import dataclass
 from app.services import get_db, get_collection
 from app.services.gemini import (
     generate_interview_questions, 
     rate_response,
-    generate_transition,
-    generate_interview_summary
+    rate_responses_batch,
+    rate_and_transition,
+    generate_interview_summary,
+    generate_interview_summary_stream
 )
-from app.services.audio import generate_audio
-from app.utils import format_question
+from app.services.audio import generate_audio, DEFAULT_VOICE
+from app.utils import format_question, word_overlap, LRUCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -30,6 +32,22 @@ FALLBACK_QUESTIONS = [
     "What interests you most about this role and company?"
 ]
 
+@dataclass
+class InterviewState:
+    """The per-interview fields every turn needs, cached in-process"""
+    questions: list
+    question_index: int
+    voice_style: str = None
+
+# Interview state by interview_id; Mongo stays the source of truth and is
+# only read on a miss
+_interview_states = LRUCache(maxsize=1024)
+
+# Background rating writes by interview_id, awaited before insights are built
+_pending_ratings = {}
+
+_STATE_PROJECTION = {"_id": 0, "questions": 1, "question_index": 1, "voice_used": 1}
+
 async def create_interview(resume_text, job_description):
     """
     Create a new interview with generated questions
@@ -81,31 +99,61 @@ async def create_interview(resume_text, job_description):
                 "interview_date": datetime.datetime.now().isoformat(),
                 "insights": {}
             },
-            "created_at": asyncio.get_running_loop().time()
+            "created_at": datetime.datetime.now(datetime.timezone.utc)
         })
         
+        _interview_states[interview_id] = InterviewState(questions=questions, question_index=0)
+        
+        # Questions are fixed at creation, so start synthesizing the first one
+        # now; the WebSocket handler picks it up from the audio cache
+        asyncio.create_task(generate_audio(questions[0], voice_name=DEFAULT_VOICE))
+        
         return {"interview_id": interview_id, "questions": questions}
     except Exception as e:
         logger.error(f"Error creating interview: {str(e)}", exc_info=True)
         raise RuntimeError(f"Failed to create interview: {str(e)}")
 
-async def get_interview_data(interview_id):
+async def get_interview_data(interview_id, projection=None):
     """
     Get interview data by ID
     
     Args:
         interview_id (str): The interview ID
+        projection (dict, optional): Fields to include or exclude
         
     Returns:
         dict: Interview data
     """
     try:
         interviews = get_collection('interviews')
-        return await interviews.find_one({"interview_id": interview_id})
+        return await interviews.find_one({"interview_id": interview_id}, projection)
     except Exception as e:
         logger.error(f"Error retrieving interview data: {str(e)}", exc_info=True)
         return None
 
+async def get_interview_state(interview_id):
+    """
+    Get the cached state of an interview, loading it on a miss
+    
+    Args:
+        interview_id (str): The interview ID
+        
+    Returns:
+        InterviewState: Interview state, or None if the interview does not exist
+    """
+    state = _interview_states.get(interview_id)
+    if state is None:
+        interview = await get_interview_data(interview_id, _STATE_PROJECTION)
+        if not interview:
+            return None
+        state = InterviewState(
+            questions=interview["questions"],
+            question_index=interview["question_index"],
+            voice_style=interview.get("voice_used")
+        )
+        _interview_states[interview_id] = state
+    return state
+
 async def process_interview_response(interview_id, message_data=None, role=None, content=None):
     """
     Process an interview response and update the interview
@@ -117,20 +165,20 @@ async def process_interview_response(interview_id, message_data=None, role=None,
         content (str, optional): Message content (used if message_data is None)
         
     Returns:
-        dict: Response message to send back to client
+        dict: Response message to send back to client ("audio" holds raw MP3 bytes or None)
     """
     try:
         # Get database collection
         interviews = get_collection('interviews')
         
-        # Get interview data
-        interview = await get_interview_data(interview_id)
-        if not interview:
+        # Get interview state (cached, so most turns skip the read)
+        state = await get_interview_state(interview_id)
+        if not state:
             logger.error(f"Interview not found: {interview_id}")
             return {"role": "system", "content": "Interview not found"}
         
-        questions = interview["questions"]
-        question_index = interview["question_index"]
+        questions = state.questions
+        question_index = state.question_index
         
         # Process initial assistant message
         if role == "assistant" and content:
@@ -159,7 +207,7 @@ async def process_interview_response(interview_id, message_data=None, role=None,
                 if "transcription" in message_data and message_data["transcription"]:
                     user_transcript = message_data["transcription"]
                     logger.info(f"Received audio with transcription: {user_transcript[:50]}...")
-                elif message_data.get("content"):
+                elif message_data.get("hasAudio") or message_data.get("content"):
                     # Fall back to audio content if available but no transcription
                     # (This would be for using server-side transcription which we're not doing currently)
                     logger.warning("Audio received without transcription, but has content")
@@ -184,74 +232,40 @@ async def process_interview_response(interview_id, message_data=None, role=None,
                     "content": "No valid response received. Please try speaking again or use the text input option."
                 }
             
-            # Rate the response
-            if question_index < len(questions):
-                try:
-                    logger.info(f"Rating response for question: {questions[question_index][:50]}...")
-                    rating = await rate_response(questions[question_index], user_transcript)
-                    logger.info(f"Response rated: {rating}/10")
-                    
-                    # Update candidate details with this specific rating
-                    # This stores the rating immediately for analytics
-                    await interviews.update_one(
-                        {"interview_id": interview_id},
-                        {"$set": {
-                            f"candidate_details.ratings.q{question_index}": rating,
-                            "candidate_details.last_question_answered": question_index,
-                            "candidate_details.last_update": datetime.datetime.now().isoformat()
-                        }}
-                    )
-                except Exception as e:
-                    logger.error(f"Error rating response: {str(e)}")
-                    rating = 5.0  # Default if rating fails
-            else:
-                rating = 5.0  # Default if no question
-            
-            # Update interview with user response
-            await interviews.update_one(
-                {"interview_id": interview_id},
-                {"$push": {"history": {"role": "user", "content": user_transcript, "rating": rating}}}
-            )
-            
-            # Increment question index
+            # The rating is only used for analytics, so it is stored in the
+            # background after the turn
+            rating_task = None
+            prev_question_index = question_index
             question_index += 1
-            await interviews.update_one(
-                {"interview_id": interview_id},
-                {"$set": {"question_index": question_index}}
-            )
-            
-            # Check if there are more questions
-            if question_index < len(questions):
+            has_next_question = question_index < len(questions)
+            if has_next_question:
                 # Get next question
                 next_question = questions[question_index]
-                prev_question = questions[question_index - 1]
+                prev_question = questions[prev_question_index]
+                
+                # Rate the response and generate the transition in one Gemini call
+                logger.info(f"Rating response for question: {prev_question[:50]}...")
+                fused_task = asyncio.create_task(rate_and_transition(prev_question, user_transcript, next_question))
+                rating_task = asyncio.create_task(_fused_rating(fused_task))
                 
                 # Generate transition
                 try:
-                    transition_text = await generate_transition(prev_question, next_question)
+                    _, transition_text = await fused_task
                     
                     # Check if transition already contains the question (or significant portion)
                     question_already_in_transition = False
                     
                     # Look for question overlap - check if significant parts of the question
                     # (more than 60% of words) already exist in the transition
-                    next_question_words = set(next_question.lower().split())
-                    transition_words = set(transition_text.lower().split())
+                    overlap_ratio = word_overlap(next_question, transition_text)
                     
-                    # Calculate overlap ratio
-                    if next_question_words:
-                        overlap_count = len(next_question_words.intersection(transition_words))
-                        overlap_ratio = overlap_count / len(next_question_words)
-                        
-                        # If more than 60% of the question words are in the transition
-                        if overlap_ratio > 0.6:
-                            question_already_in_transition = True
-                            logger.info(f"Question already in transition (overlap: {overlap_ratio:.2f})")
-                            full_response = transition_text
-                        else:
-                            # Combine transition and question only if not already included
-                            full_response = f"{transition_text} {next_question}" if transition_text else next_question
+                    # If more than 60% of the question words are in the transition
+                    if overlap_ratio > 0.6:
+                        question_already_in_transition = True
+                        logger.info(f"Question already in transition (overlap: {overlap_ratio:.2f})")
+                        full_response = transition_text
                     else:
+                        # Combine transition and question only if not already included
                         full_response = f"{transition_text} {next_question}" if transition_text else next_question
                         
                 except Exception as e:
@@ -263,92 +277,95 @@ async def process_interview_response(interview_id, message_data=None, role=None,
                 # IMPROVED: Better format the question to make it less "question-like" for TTS
                 tts_text = full_response.rstrip()
                 if tts_text.endswith('?'):
-                    # Add a period after question marks to make it less question-like for the TTS system
-                    tts_text = tts_text.replace('?', '?.')
+                    # Add a period after the closing question mark to make it less question-like for the TTS system
+                    tts_text += '.'
                     logger.info("Added period after question mark to discourage question answering")
                 
+                # Start audio generation as soon as the text is known, so it
+                # overlaps the database write
+                audio_task = asyncio.create_task(generate_audio(tts_text, voice_name=voice_style))
+                audio_start_time = time.time()
+            elif prev_question_index < len(questions):
+                # Last answer: no transition is needed, so rate it on its own
+                logger.info(f"Rating response for question: {questions[prev_question_index][:50]}...")
+                rating_task = asyncio.create_task(rate_response(questions[prev_question_index], user_transcript))
+            
+            if has_next_question:
+                assistant_entry = {"role": "assistant", "content": full_response}
+            else:
+                # End of interview - do NOT generate voice for closing message
+                closing_message = "Thank you for completing this interview. Your responses have been recorded."
+                assistant_entry = {"role": "assistant", "content": closing_message, "final": True}
+            
+            # Record the whole turn in one write: both history entries, the
+            # new question index and any status change
+            turn_update = {"question_index": question_index}
+            if not has_next_question:
+                # Mark interview as completed
+                turn_update["candidate_details.status"] = "completed"
+                turn_update["candidate_details.completion_date"] = datetime.datetime.now().isoformat()
+            elif voice_style:
+                # Store voice style preferences for history
+                turn_update["voice_used"] = voice_style
+            
+            await interviews.update_one(
+                {"interview_id": interview_id},
+                {
+                    "$push": {"history": {"$each": [
+                        # question_index lets the background rating find this entry
+                        {"role": "user", "content": user_transcript, "question_index": prev_question_index, "rating": None},
+                        assistant_entry
+                    ]}},
+                    "$set": turn_update
+                }
+            )
+            state.question_index = question_index
+            if has_next_question and voice_style:
+                state.voice_style = voice_style
+            
+            # Backfill the rating once it arrives; the entry now exists to update
+            if rating_task is not None:
+                _schedule_rating(interview_id, prev_question_index, rating_task)
+            
+            # Check if there are more questions
+            if has_next_question:
                 # Log the full response being sent
                 logger.info(f"Sending next question: {full_response}")
                 
-                # Update history with assistant response immediately
-                await interviews.update_one(
-                    {"interview_id": interview_id},
-                    {"$push": {"history": {"role": "assistant", "content": full_response}}}
-                )
-                
-                # Store voice style preferences for history
-                if voice_style:
-                    await interviews.update_one(
-                        {"interview_id": interview_id, "question_index": question_index},
-                        {"$set": {"voice_used": voice_style}}
-                    )
-                
-                # Start audio generation in a dedicated task to avoid blocking
-                audio_task = asyncio.create_task(generate_audio(tts_text, voice_name=voice_style))
-                
                 # Wait for audio with a timeout
-                audio_start_time = time.time()
+                audio_bytes = None
                 try:
                     # IMPROVED: Reduced timeout to catch problematic audio generation earlier
-                    audio_bytes = await asyncio.wait_for(audio_task, timeout=7.0)
+                    async with asyncio.timeout(7.0):
+                        audio_bytes = await audio_task
                     
                     if audio_bytes:
-                        audio_size = len(audio_bytes)
-                        # Explicitly handle base64 encoding with error handling
-                        try:
-                            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-                            encoded_size = len(audio_base64)
-                            logger.info(f"✅ Audio generated successfully: {audio_size} bytes raw, {encoded_size} bytes encoded in {time.time() - audio_start_time:.2f} seconds")
-                        except Exception as e:
-                            logger.error(f"❌ Error encoding audio to base64: {str(e)}")
-                            audio_base64 = ""
+                        logger.info(f"✅ Audio generated successfully: {len(audio_bytes)} bytes in {time.time() - audio_start_time:.2f} seconds")
                     else:
                         logger.warning("⚠️ Audio generation returned None")
-                        audio_base64 = ""
-                except asyncio.TimeoutError:
+                except TimeoutError:
                     logger.warning(f"⚠️ Audio generation timed out after {time.time() - audio_start_time:.2f} seconds")
-                    audio_base64 = ""
                 except Exception as e:
                     logger.error(f"❌ Error generating audio: {str(e)}", exc_info=True)
-                    audio_base64 = ""
                 
-                # Create the response object
+                # Create the response object; raw audio bytes are sent by the
+                # caller as a separate binary frame
                 response = {
                     "role": "assistant",
                     "content": full_response,
-                    "audio": audio_base64,
-                    "rating": rating
+                    "audio": audio_bytes or None
                 }
                 
                 # Log whether audio is included in the response
-                if (audio_base64):
-                    logger.info(f"🎵 Including audio in response: {len(audio_base64)} bytes")
+                if audio_bytes:
+                    logger.info(f"🎵 Including audio in response: {len(audio_bytes)} bytes")
                 else:
                     logger.warning("⚠️ No audio in response, sending text only")
                 
                 return response
                 
             else:
-                # End of interview - do NOT generate voice for closing message
-                closing_message = "Thank you for completing this interview. Your responses have been recorded."
-                
                 # No audio generation for closing message - this is intentional
-                audio_base64 = ""
-                
-                # Update history with assistant response
-                await interviews.update_one(
-                    {"interview_id": interview_id},
-                    {"$push": {"history": {"role": "assistant", "content": closing_message, "final": True}}}
-                )
-                
-                # Update candidate details to mark interview as completed
-                await interviews.update_one(
-                    {"interview_id": interview_id},
-                    {"$set": {
-                        "candidate_details.status": "completed",
-                        "candidate_details.completion_date": datetime.datetime.now().isoformat()
-                    }}
-                )
                 
                 # Generate insights asynchronously
                 asyncio.create_task(generate_interview_insights(interview_id))
@@ -357,8 +374,7 @@ async def process_interview_response(interview_id, message_data=None, role=None,
                 return {
                     "role": "assistant",
                     "content": closing_message,
-                    "audio": audio_base64,  # Empty string
-                    "rating": rating,
+                    "audio": None,
                     "interviewComplete": True
                 }
         
@@ -368,6 +384,163 @@ async def process_interview_response(interview_id, message_data=None, role=None,
         logger.error(f"Error processing interview response: {str(e)}", exc_info=True)
         return {"role": "system", "content": f"Error processing response: {str(e)}"}
 
+async def _await_rating(rating_task):
+    """
+    Wait for a rating task, falling back to the default rating
+    
+    Args:
+        rating_task (asyncio.Task | None): Pending rate_response task
+        
+    Returns:
+        float: Rating between 1-10
+    """
+    if rating_task is None:
+        return 5.0  # Default if no question
+    try:
+        rating = await rating_task
+        logger.info(f"Response rated: {rating}/10")
+        return rating
+    except Exception as e:
+        logger.error(f"Error rating response: {str(e)}")
+        return 5.0  # Default if rating fails
+
+async def _fused_rating(fused_task):
+    """Get the rating from a rate_and_transition task"""
+    rating, _ = await fused_task
+    return rating
+
+def _schedule_rating(interview_id, question_index, rating_task):
+    """Store a rating in the background, tracking it until it is written"""
+    task = asyncio.create_task(_store_rating(interview_id, question_index, rating_task))
+    pending = _pending_ratings.setdefault(interview_id, set())
+    pending.add(task)
+    
+    def _discard(done_task):
+        pending.discard(done_task)
+        if not pending and _pending_ratings.get(interview_id) is pending:
+            del _pending_ratings[interview_id]
+    
+    task.add_done_callback(_discard)
+
+async def _store_rating(interview_id, question_index, rating_task):
+    """
+    Wait for a rating and write it to the answer's history entry and the
+    candidate details
+    
+    Args:
+        interview_id (str): The interview ID
+        question_index (int): Index of the answered question
+        rating_task (asyncio.Task): Pending rate_response task
+    """
+    rating = await _await_rating(rating_task)
+    try:
+        interviews = get_collection('interviews')
+        await interviews.update_one(
+            {"interview_id": interview_id},
+            {
+                "$set": {
+                    "history.$[answer].rating": rating,
+                    f"candidate_details.ratings.q{question_index}": rating,
+                    "candidate_details.last_update": datetime.datetime.now().isoformat()
+                },
+                # Ratings can finish out of order
+                "$max": {"candidate_details.last_question_answered": question_index}
+            },
+            array_filters=[{"answer.role": "user", "answer.question_index": question_index}]
+        )
+    except Exception as e:
+        logger.error(f"Error storing rating: {str(e)}")
+
+def _score_ratings(ratings):
+    """
+    Reduce per-answer ratings to the numeric insight metrics
+    
+    Args:
+        ratings (list): Rating of each answer (None or 0 if unrated)
+        
+    Returns:
+        tuple: (average rating, rated answer count, indices rated 8 or more,
+            indices rated 4 or less)
+    """
+    total_rating = 0
+    rating_count = 0
+    strong = []
+    weak = []
+    for i, rating in enumerate(ratings):
+        if rating:
+            total_rating += rating
+            rating_count += 1
+            if rating >= 8:
+                strong.append(i)
+            elif rating <= 4:
+                weak.append(i)
+    
+    avg_rating = total_rating / rating_count if rating_count > 0 else 0
+    return avg_rating, rating_count, strong, weak
+
+def _qa_pairs(history):
+    """Pair each question in the history with the answer that follows it"""
+    return [
+        {
+            "question": question_entry["content"],
+            "answer": answer_entry["content"],
+            "rating": answer_entry.get("rating", None)
+        }
+        for question_entry, answer_entry in zip(history[0::2], history[1::2])
+    ]
+
+async def _iter_text(text):
+    """Yield a complete text as a single chunk"""
+    yield text
+
+def _question_topic(question):
+    """Extract a short topic from a question"""
+    topic = question.split("?")[0].strip()
+    if len(topic) > 50:
+        topic = topic[:50] + "..."
+    return topic
+
+# Only the fields insights are built from (never the full resume)
+_INSIGHTS_PROJECTION = {
+    "_id": 0,
+    "history": 1,
+    "questions": 1,
+    "summary": 1,
+    "job_description": 1,
+    "candidate_details": 1
+}
+
+async def stream_interview_summary(interview_id):
+    """
+    Get the interview summary as a stream of text chunks
+    
+    A stored summary is returned in one chunk; otherwise a finished
+    interview's summary is streamed from Gemini as it is generated (it is
+    not stored - generate_interview_insights remains the source of record).
+    
+    Args:
+        interview_id (str): The interview ID
+        
+    Returns:
+        AsyncIterator[str]: Summary text chunks, or None if the interview does not exist
+    """
+    # Let background ratings land first so the summary includes them
+    pending = _pending_ratings.get(interview_id)
+    if pending:
+        await asyncio.wait(set(pending))
+    
+    interview = await get_interview_data(interview_id, _INSIGHTS_PROJECTION)
+    if not interview:
+        return None
+    
+    if interview.get("summary"):
+        return _iter_text(interview["summary"])
+    if len(interview["history"]) < len(interview["questions"]) * 2:
+        return _iter_text("Interview not yet completed. Summary will be available when all questions are answered.")
+    
+    job_description = interview.get("job_description", "Not provided")
+    return generate_interview_summary_stream(job_description, _qa_pairs(interview["history"]))
+
 async def generate_interview_insights(interview_id):
     """
     Generate insights for an interview
@@ -381,58 +554,45 @@ async def generate_interview_insights(interview_id):
     # Get database collection
     interviews = get_collection('interviews')
     
-    interview = await get_interview_data(interview_id)
+    # Let background ratings land first so the insights include them
+    pending = _pending_ratings.get(interview_id)
+    if pending:
+        await asyncio.wait(set(pending))
+    
+    interview = await get_interview_data(interview_id, _INSIGHTS_PROJECTION)
     if not interview:
         return None
     
+    # Kept in step with the writes below, so no second read is needed
+    candidate_details = interview.get("candidate_details", {})
+    
     # Check if summary already exists
     if interview.get("summary"):
         summary = interview["summary"]
     elif len(interview["history"]) >= len(interview["questions"]) * 2:
         # Generate summary if interview is complete
         try:
-            # Extract Q&A pairs
             history = interview["history"]
-            qa_pairs = []
+            qa_pairs = _qa_pairs(history)
             
-            # Calculate key metrics
-            total_rating = 0
-            rating_count = 0
-            key_strengths = []
-            areas_for_improvement = []
+            # Rate any answers whose background rating never landed (e.g. the
+            # server restarted mid-interview), all at once
+            unrated = [i for i, pair in enumerate(qa_pairs) if pair["rating"] is None]
+            rating_updates = {}
+            if unrated:
+                ratings = await rate_responses_batch([(qa_pairs[i]["question"], qa_pairs[i]["answer"]) for i in unrated])
+                for i, rating in zip(unrated, ratings):
+                    qa_pairs[i]["rating"] = rating
+                    history[2 * i + 1]["rating"] = rating
+                    rating_updates[f"history.{2 * i + 1}.rating"] = rating
+                    rating_updates[f"candidate_details.ratings.q{i}"] = rating
+                    candidate_details.setdefault("ratings", {})[f"q{i}"] = rating
             
-            for i in range(0, len(history), 2):
-                if i+1 < len(history):
-                    question = history[i]["content"]
-                    answer = history[i+1]["content"]
-                    rating = history[i+1].get("rating", None)
-                    
-                    if rating:
-                        total_rating += rating
-                        rating_count += 1
-                        
-                        # Add to strengths or improvements based on rating
-                        if rating >= 8:
-                            # Extract topic from question
-                            topic = question.split("?")[0].strip()
-                            if len(topic) > 50:
-                                topic = topic[:50] + "..."
-                            key_strengths.append(topic)
-                        elif rating <= 4:
-                            # Extract topic from question
-                            topic = question.split("?")[0].strip()
-                            if len(topic) > 50:
-                                topic = topic[:50] + "..."
-                            areas_for_improvement.append(topic)
-                    
-                    qa_pairs.append({
-                        "question": question,
-                        "answer": answer,
-                        "rating": rating
-                    })
-            
-            # Calculate average rating
-            avg_rating = total_rating / rating_count if rating_count > 0 else 0
+            # Calculate key metrics; topics are only extracted for the top 3
+            # strengths and improvement areas that are actually reported
+            avg_rating, rating_count, strong, weak = _score_ratings([pair["rating"] for pair in qa_pairs])
+            key_strengths = [_question_topic(qa_pairs[i]["question"]) for i in strong[:3]]
+            areas_for_improvement = [_question_topic(qa_pairs[i]["question"]) for i in weak[:3]]
             
             # Generate summary
             job_description = interview.get("job_description", "Not provided")
@@ -443,8 +603,8 @@ async def generate_interview_insights(interview_id):
                 "average_rating": avg_rating,
                 "questions_answered": rating_count,
                 "total_questions": len(interview["questions"]),
-                "key_strengths": key_strengths[:3],  # Top 3 strengths
-                "areas_for_improvement": areas_for_improvement[:3],  # Top 3 improvement areas
+                "key_strengths": key_strengths,  # Top 3 strengths
+                "areas_for_improvement": areas_for_improvement,  # Top 3 improvement areas
                 "completion_date": datetime.datetime.now().isoformat(),
                 "status": "completed"
             }
@@ -455,9 +615,12 @@ async def generate_interview_insights(interview_id):
                 {"$set": {
                     "summary": summary,
                     "candidate_details.status": "completed",
-                    "candidate_details.insights": insights
+                    "candidate_details.insights": insights,
+                    **rating_updates
                 }}
             )
+            candidate_details["status"] = "completed"
+            candidate_details["insights"] = insights
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}")
             summary = "Summary generation failed. Please review the transcript manually."
@@ -470,6 +633,7 @@ async def generate_interview_insights(interview_id):
                     "candidate_details.status": "completed_with_errors",
                 }}
             )
+            candidate_details["status"] = "completed_with_errors"
     else:
         summary = "Interview not yet completed. Summary will be available when all questions are answered."
         
@@ -478,13 +642,11 @@ async def generate_interview_insights(interview_id):
             {"interview_id": interview_id},
             {"$set": {"candidate_details.status": "in_progress"}}
         )
-    
-    # Get the updated interview data
-    updated_interview = await get_interview_data(interview_id)
+        candidate_details["status"] = "in_progress"
     
     return {
-        "transcript": updated_interview["history"], 
-        "questions": updated_interview["questions"],
+        "transcript": interview["history"], 
+        "questions": interview["questions"],
         "summary": summary,
-        "candidate_details": updated_interview.get("candidate_details", {})
+        "candidate_details": candidate_details
     }
@@ -1,42 +1,102 @@
 """
 PDF processing service.
 """
+import asyncio
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
+from typing import BinaryIO
 from pypdf import PdfReader
 
+# PyMuPDF (MuPDF's C extractor) is optional and much faster than pypdf;
+# it is AGPL-licensed, so pypdf remains the default when it is absent
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-async def extract_text_from_pdf(pdf_content):
+# PDFs with more pages than this are extracted page-parallel in worker processes
+_PARALLEL_PAGE_THRESHOLD = 2
+
+# Created on first use so importing the module does not spawn workers
+_pdf_pool = None
+
+def _get_pdf_pool():
+    """Return the shared process pool for page extraction"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _pdf_pool
+
+def _read_pdf_bytes(pdf_stream):
+    """Read the PDF content into bytes"""
+    if isinstance(pdf_stream, (bytes, bytearray)):
+        return bytes(pdf_stream)
+    pdf_stream.seek(0)
+    return pdf_stream.read()
+
+def _load_pdf(pdf_stream):
+    """Read the PDF into bytes and return them with the page count"""
+    pdf_bytes = _read_pdf_bytes(pdf_stream)
+    return pdf_bytes, len(PdfReader(BytesIO(pdf_bytes)).pages)
+
+def _extract_pages_mupdf(pdf_stream):
+    """Extract the text of every page with PyMuPDF"""
+    with fitz.open(stream=_read_pdf_bytes(pdf_stream), filetype="pdf") as doc:
+        if doc.needs_pass:
+            raise ValueError("File has not been decrypted")
+        return [page.get_text() for page in doc]
+
+def _extract_pages(pdf_bytes):
+    """Extract the text of every page serially"""
+    return [page.extract_text() for page in PdfReader(BytesIO(pdf_bytes)).pages]
+
+def _extract_page(pdf_bytes, index):
+    """Extract the text of a single page (runs in a worker process)"""
+    return PdfReader(BytesIO(pdf_bytes)).pages[index].extract_text()
+
+async def _extract_pages_pypdf(pdf_stream):
+    """Extract the text of every page with pypdf, fanning larger PDFs out across processes"""
+    pdf_bytes, num_pages = await asyncio.to_thread(_load_pdf, pdf_stream)
+    if num_pages <= _PARALLEL_PAGE_THRESHOLD:
+        return await asyncio.to_thread(_extract_pages, pdf_bytes)
+    
+    loop = asyncio.get_running_loop()
+    pool = _get_pdf_pool()
+    return await asyncio.gather(*(
+        loop.run_in_executor(pool, _extract_page, pdf_bytes, i)
+        for i in range(num_pages)
+    ))
+
+async def extract_text_from_pdf(pdf_stream: BinaryIO):
     """
     Extract text from PDF content
     
     Args:
-        pdf_content (bytes): Raw PDF file content
+        pdf_stream (BinaryIO): Seekable binary file object with the PDF content
+            (raw bytes are also accepted)
         
     Returns:
         str: Extracted text
     """
-    if not pdf_content:
+    if not pdf_stream:
         raise ValueError("No PDF content provided")
         
     try:
-        # Create BytesIO object from bytes
-        pdf_file = BytesIO(pdf_content)
-        
-        # Initialize PDF reader
-        reader = PdfReader(pdf_file)
+        # Parsing is CPU-bound, so keep it off the event loop
+        if fitz is not None:
+            pages = await asyncio.to_thread(_extract_pages_mupdf, pdf_stream)
+        else:
+            pages = await _extract_pages_pypdf(pdf_stream)
         
-        if len(reader.pages) == 0:
+        if not pages:
             raise ValueError("PDF file has no pages")
         
-        # Extract text from each page
-        resume_text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                resume_text += page_text + "\n"
+        resume_text = "".join(page_text + "\n" for page_text in pages if page_text)
         
         # Check if we got some meaningful text
         if not resume_text.strip():
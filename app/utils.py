@@ -2,7 +2,14 @@
 Utility functions for the application.
 """
 import re
+from collections import OrderedDict
+from functools import lru_cache
 
+# Question numbering (e.g., "1.", "Q1:", etc.) and whole-question quotes
+_PREFIX_RE = re.compile(r'^(?:\d+\.|\[?\d+\]?|Q\d+:?|Question\s+\d+:?)\s*')
+_QUOTE_RE = re.compile(r'''^(["'])(.*)\1$''')
+
+@lru_cache(maxsize=1024)
 def format_question(question_text):
     """
     Clean and standardize question format to ensure conciseness
@@ -13,20 +20,90 @@ def format_question(question_text):
     Returns:
         str: Formatted question
     """
-    # Remove question numbering (e.g., "1.", "Q1:", etc.)
-    cleaned = re.sub(r'^(?:\d+\.|\[?\d+\]?|Q\d+:?|Question\s+\d+:?)\s*', '', question_text.strip())
+    # Remove question numbering
+    cleaned = _PREFIX_RE.sub('', question_text.strip(), count=1)
     
     # Remove quotes if the entire question is quoted
-    cleaned = re.sub(r'^"(.*)"$', r'\1', cleaned)
-    cleaned = re.sub(r'^\'(.*)\'$', r'\1', cleaned)
+    match = _QUOTE_RE.match(cleaned)
+    if match:
+        cleaned = match.group(2)
     
     # Ensure question ends with question mark if it doesn't already
-    if cleaned and not cleaned.endswith('?'):
-        if not any(cleaned.endswith(x) for x in ['.', '!', ':']):
-            cleaned += '?'
+    if cleaned and not cleaned.endswith(('?', '.', '!', ':')):
+        cleaned += '?'
     
     # Capitalize first letter
-    if cleaned:
-        cleaned = cleaned[0].upper() + cleaned[1:]
+    return cleaned[:1].upper() + cleaned[1:]
+
+# Common question openers, checked in a single str.startswith call
+_QUESTION_PREFIXES = ("what", "how", "why", "can", "could", "would", "tell", "describe", "explain")
+
+def is_question(text):
+    """
+    Determine if a message is a question based on content
+    
+    Args:
+        text (str): Message text
+        
+    Returns:
+        bool: True if the message looks like a question
+    """
+    # Simple heuristic: check if the message starts with common question words
+    # or ends with a question mark
+    text_lower = text.lower().lstrip()
+    return text_lower.startswith(_QUESTION_PREFIXES) or text_lower.rstrip().endswith("?")
+
+# Width of the hashed bag-of-words signature used by word_overlap
+_SIGNATURE_BITS = 256
+
+@lru_cache(maxsize=1024)
+def word_signature(text):
+    """
+    Hash the lowercased words of a text into a fixed-width bit vector
+    
+    Args:
+        text (str): Text to hash
+        
+    Returns:
+        int: Bag-of-words signature with one bit set per distinct word
+    """
+    bits = 0
+    for word in text.lower().split():
+        bits |= 1 << (hash(word) % _SIGNATURE_BITS)
+    return bits
+
+def word_overlap(text, other):
+    """
+    Estimate the fraction of the words in text that also appear in other
+    
+    Args:
+        text (str): Reference text
+        other (str): Text to compare against
+        
+    Returns:
+        float: Overlap ratio between 0 and 1 (0 if text has no words)
+    """
+    text_bits = word_signature(text)
+    if not text_bits:
+        return 0.0
+    return (text_bits & word_signature(other)).bit_count() / text_bits.bit_count()
+
+class LRUCache(OrderedDict):
+    """Bounded mapping that evicts the least recently used entry"""
+    
+    def __init__(self, maxsize=128):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def get(self, key, default=None):
+        """Get a value and mark it as recently used"""
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        return default
     
-    return cleaned
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
@@ -5,17 +5,30 @@ import locale
 import datetime
 import socket
 import argparse
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
-import google.generativeai as genai
 import uvicorn
 
+# uvloop is optional; uvicorn falls back to the standard asyncio loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# psutil is optional; it lets the port scan skip ports that are already listening
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # Import application modules
-from app.routes import register_routes
-from app.services import init_services
+from app.routes import register_routes, WS_MAX_BODY
+from app.services import init_services, warm_up_services
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', encoding='utf-8')
@@ -34,11 +47,22 @@ args = parser.parse_args()
 # Gemini API initialization flag
 _gemini_initialized = False
 
+# MongoDB client shared by every create_app() call, so reloads reuse its pool
+_db_client = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm connection pools so the first interview turn does not pay for them
+    await warm_up_services()
+    yield
+
 def create_app():
     # Initialize FastAPI app
     app = FastAPI(
         title="AI Voice Interviewer", 
-        description="An AI-powered platform for conducting voice interviews"
+        description="An AI-powered platform for conducting voice interviews",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
     )
     
     # Configure CORS
@@ -62,14 +86,24 @@ def create_app():
     if not all([mongodb_uri, mongodb_db, gemini_api_key]):
         raise ValueError("Missing required environment variables")
     
-    # Initialize database connection
-    db_client = AsyncIOMotorClient(mongodb_uri)
-    db = db_client[mongodb_db]
+    # Initialize database connection, keeping a pool of warm connections open
+    global _db_client
+    if _db_client is None:
+        _db_client = AsyncIOMotorClient(
+            mongodb_uri,
+            minPoolSize=10,
+            maxPoolSize=50,
+            maxIdleTimeMS=60000
+        )
+    db = _db_client[mongodb_db]
     
-    # Configure Gemini API key globally
+    # Configure Gemini API key globally. gRPC keeps long-lived HTTP/2
+    # channels, so concurrent calls are multiplexed over them instead of
+    # opening a connection each
     global _gemini_initialized
     if not _gemini_initialized:
-        genai.configure(api_key=gemini_api_key)
+        import google.generativeai as genai
+        genai.configure(api_key=gemini_api_key, transport="grpc")
         _gemini_initialized = True
         logger.info("Gemini API configured globally")
     
@@ -90,11 +124,24 @@ def is_port_in_use(port, host='0.0.0.0'):
         except socket.error:
             return True
 
+def listening_ports():
+    """Get the set of ports with a listening socket, or None if unavailable"""
+    if psutil is None:
+        return None
+    try:
+        return {conn.laddr.port for conn in psutil.net_connections(kind='inet') if conn.status == psutil.CONN_LISTEN}
+    except (psutil.Error, OSError):
+        # Listing connections may need elevated privileges (e.g. on macOS)
+        return None
+
 def find_available_port(start_port=8000, max_attempts=100):
     """Find an available port starting from start_port"""
+    # One connection listing replaces most of the bind attempts; the bind
+    # still confirms the chosen port
+    used_ports = listening_ports() or set()
     port = start_port
     for _ in range(max_attempts):
-        if not is_port_in_use(port):
+        if port not in used_ports and not is_port_in_use(port):
             return port
         port += 1
     raise RuntimeError(f"Could not find an available port after {max_attempts} attempts")
@@ -114,8 +161,8 @@ if __name__ == "__main__":
     # Check if port is in use
     if is_port_in_use(port, host):
         if args.auto_port:
-            # Find an available port
-            new_port = find_available_port(port)
+            # Find an available port (the requested one is already known to be taken)
+            new_port = find_available_port(port + 1)
             logger.warning(f"Port {port} is already in use. Using port {new_port} instead.")
             port = new_port
         else:
@@ -130,10 +177,13 @@ if __name__ == "__main__":
             sys.exit(1)
     
     # Configure uvicorn with proper error handling and encoding settings
-    logger.info(f"Starting server on {host}:{port}")
+    event_loop = "uvloop" if uvloop else "asyncio"
+    logger.info(f"Starting server on {host}:{port} ({event_loop} event loop)")
     uvicorn.run(
         "main:app", 
         host=host, 
         port=port, 
-        log_level="info"
+        log_level="info",
+        loop=event_loop,
+        ws_max_size=WS_MAX_BODY
     )
\ No newline at end of file
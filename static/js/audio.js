@@ -137,30 +137,18 @@ function stopRecording() {
 }
 
 /**
- * Play audio from base64 string using HTML5 Audio
- * @param {string} audioBase64 - Base64 encoded audio data
+ * Play audio using HTML5 Audio
+ * @param {Uint8Array|string} audioData - Raw audio bytes or base64 encoded audio data
  */
-function playAudio(audioBase64) {
-    if (!audioBase64) {
+function playAudio(audioData) {
+    if (!audioData) {
         console.warn("No audio data provided to playAudio");
         return;
     }
     
-    console.log("Received audio data length:", audioBase64.length);
+    console.log("Received audio data length:", audioData.length);
     
     try {
-        // Make sure we have valid base64 data (it should be a non-empty string)
-        if (typeof audioBase64 !== 'string' || audioBase64.trim() === '') {
-            console.error("Invalid audio data format:", typeof audioBase64);
-            return;
-        }
-        
-        // Some base64 strings might start with // or have other prefixes, clean them up
-        let cleanBase64 = audioBase64;
-        if (audioBase64.startsWith('//')) {
-            cleanBase64 = audioBase64.substring(2);
-        }
-        
         // Try multiple formats if the first one fails
         const formats = [
             { mime: 'audio/mp3', ext: 'mp3' },
@@ -172,11 +160,10 @@ function playAudio(audioBase64) {
         
         let audioBlob = null;
         
-        // Convert base64 to binary
-        const binaryString = atob(cleanBase64);
-        const bytes = new Uint8Array(binaryString.length);
-        for (let i = 0; i < binaryString.length; i++) {
-            bytes[i] = binaryString.charCodeAt(i);
+        // Raw bytes from a binary frame can be used directly
+        const bytes = audioData instanceof Uint8Array ? audioData : base64ToBytes(audioData);
+        if (!bytes) {
+            return;
         }
         
         // Create blobs for different formats and try each one
@@ -242,6 +229,33 @@ function playAudio(audioBase64) {
     }
 }
 
+/**
+ * Convert base64 audio data to bytes
+ * @param {string} audioBase64 - Base64 encoded audio
+ * @returns {Uint8Array|null} Decoded bytes or null if the data is invalid
+ */
+function base64ToBytes(audioBase64) {
+    // Make sure we have valid base64 data (it should be a non-empty string)
+    if (typeof audioBase64 !== 'string' || audioBase64.trim() === '') {
+        console.error("Invalid audio data format:", typeof audioBase64);
+        return null;
+    }
+    
+    // Some base64 strings might start with // or have other prefixes, clean them up
+    let cleanBase64 = audioBase64;
+    if (audioBase64.startsWith('//')) {
+        cleanBase64 = audioBase64.substring(2);
+    }
+    
+    // Convert base64 to binary
+    const binaryString = atob(cleanBase64);
+    const bytes = new Uint8Array(binaryString.length);
+    for (let i = 0; i < binaryString.length; i++) {
+        bytes[i] = binaryString.charCodeAt(i);
+    }
+    return bytes;
+}
+
 /**
  * Stop currently playing audio
  */
@@ -257,47 +271,15 @@ function stopCurrentAudio() {
 }
 
 /**
- * Convert Blob to base64
- * @param {Blob} blob - Audio blob
- * @returns {Promise<string>} Base64 encoded data
+ * Check whether any audio was recorded
+ * @returns {boolean} True if there are recorded audio chunks
  */
-function blobToBase64(blob) {
-    return new Promise((resolve, reject) => {
-        const reader = new FileReader();
-        reader.onloadend = () => {
-            const base64data = reader.result.split(',')[1];
-            resolve(base64data);
-        };
-        reader.onerror = reject;
-        reader.readAsDataURL(blob);
-    });
-}
-
-/**
- * Get recorded audio as base64
- * @returns {Promise<string|null>} Base64 encoded audio or null if no audio
- */
-async function getRecordedAudioBase64() {
-    if (audioChunks.length === 0) {
-        console.warn("No audio chunks to convert to base64");
-        return null;
-    }
-    
-    console.log(`Converting ${audioChunks.length} audio chunks to base64`);
-    
-    try {
-        const audioBlob = new Blob(audioChunks, { type: 'audio/wav' });
-        console.log("Created audio blob of size:", audioBlob.size);
-        
-        return await blobToBase64(audioBlob);
-    } catch (error) {
-        console.error("Error converting audio to base64:", error);
-        return null;
-    }
+function hasRecordedAudio() {
+    return audioChunks.length > 0;
 }
 
 // Export public API
 export {
-    getRecordedAudioBase64, playAudio, setupAudioHandling, startRecording, stopCurrentAudio, stopRecording
+    hasRecordedAudio, playAudio, setupAudioHandling, startRecording, stopCurrentAudio, stopRecording
 };
 
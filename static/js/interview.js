@@ -1,7 +1,7 @@
 /**
  * Interview module handling the interview flow and WebSocket communication
  */
-import { getRecordedAudioBase64, playAudio, startRecording, stopCurrentAudio, stopRecording } from './audio.js';
+import { hasRecordedAudio, playAudio, startRecording, stopCurrentAudio, stopRecording } from './audio.js';
 import { getTranscription, resetTranscription, startRecognition, stopRecognition } from './speech.js';
 import {
     displayMessage,
@@ -18,6 +18,7 @@ let interviewId = null;
 let textResponseInput, sendTextBtn, viewInsightsBtn;
 let isProcessingResponse = false; // Flag to prevent duplicate submissions
 let isRecording = false;
+let awaitingAudioFrame = false; // Set when a message announced a following binary audio frame
 
 /**
  * Set up interview functionality
@@ -92,6 +93,7 @@ async function connectWebSocket() {
         }
         
         websocket = new WebSocket(wsUrl);
+        websocket.binaryType = 'arraybuffer';
         
         websocket.onopen = () => {
             console.log('WebSocket connection established');
@@ -118,61 +120,30 @@ async function connectWebSocket() {
 
 /**
  * Handle WebSocket message event
+ *
+ * The server sends JSON messages as text frames. A message with `hasAudio`
+ * set is followed by a binary frame containing the raw MP3 audio.
  * @param {MessageEvent} event - WebSocket message event
  */
 function handleWebSocketMessage(event) {
-    try {
-        const message = JSON.parse(event.data);
-        console.log("WebSocket message received:", message);
-        
-        // Check for the role field which should be present in all messages
-        if (!message.role) {
-            console.warn("Message missing role field:", message);
-            message.role = "system"; // Default to system if missing
-        }
-        
-        // Handle assistant messages (questions or responses)
-        if (message.role === "assistant") {
-            // Display assistant message
-            displayMessage({
-                role: "assistant",
-                content: message.content
-            });
-            
-            // Play audio if available - remove isQuestion check to play all audio
-            if (message.audio) {
-                console.log("Playing audio from assistant message");
-                playAudio(message.audio);
-            } else {
-                console.log("No audio data in assistant message");
-            }
-            
-            // Signal processing complete
-            isProcessingResponse = false;
-            hideLoading();
-        } 
-        // Handle system messages
-        else if (message.role === "system") {
-            displayMessage({
-                role: "system",
-                content: message.content || "System message"
-            });
-            isProcessingResponse = false;
-            hideLoading();
+    // Binary frames carry the audio announced by the previous message
+    if (typeof event.data !== 'string') {
+        if (awaitingAudioFrame) {
+            awaitingAudioFrame = false;
+            console.log("Playing audio from binary frame");
+            playAudio(new Uint8Array(event.data));
+        } else {
+            console.warn("Unexpected binary frame received");
         }
-        // Handle any message with content but no specific role handling
-        else if (message.content) {
-            displayMessage(message);
-            isProcessingResponse = false;
-            hideLoading();
-        }
-        
-        // Check if interview is complete
-        if (message.interviewComplete) {
-            viewInsightsBtn.style.display = 'inline-block';
-            viewInsightsBtn.onclick = () => {
-                window.location.href = `/insights.html?interview=${interviewId}`;
-            };
+        return;
+    }
+    
+    try {
+        // Several messages may be coalesced into one frame as a JSON array
+        const parsed = JSON.parse(event.data);
+        const messages = Array.isArray(parsed) ? parsed : [parsed];
+        for (const message of messages) {
+            handleServerMessage(message);
         }
     } catch (error) {
         console.error("Error handling WebSocket message:", error);
@@ -182,6 +153,67 @@ function handleWebSocketMessage(event) {
     }
 }
 
+/**
+ * Handle a single message from the server
+ * @param {Object} message - Parsed server message
+ */
+function handleServerMessage(message) {
+    console.log("WebSocket message received:", message);
+    
+    // Check for the role field which should be present in all messages
+    if (!message.role) {
+        console.warn("Message missing role field:", message);
+        message.role = "system"; // Default to system if missing
+    }
+    
+    // Handle assistant messages (questions or responses)
+    if (message.role === "assistant") {
+        // Display assistant message
+        displayMessage({
+            role: "assistant",
+            content: message.content
+        });
+        
+        // Play audio if available - remove isQuestion check to play all audio
+        if (message.hasAudio) {
+            // Audio arrives in the next (binary) frame
+            awaitingAudioFrame = true;
+        } else if (message.audio) {
+            console.log("Playing audio from assistant message");
+            playAudio(message.audio);
+        } else {
+            console.log("No audio data in assistant message");
+        }
+        
+        // Signal processing complete
+        isProcessingResponse = false;
+        hideLoading();
+    } 
+    // Handle system messages
+    else if (message.role === "system") {
+        displayMessage({
+            role: "system",
+            content: message.content || "System message"
+        });
+        isProcessingResponse = false;
+        hideLoading();
+    }
+    // Handle any message with content but no specific role handling
+    else if (message.content) {
+        displayMessage(message);
+        isProcessingResponse = false;
+        hideLoading();
+    }
+    
+    // Check if interview is complete
+    if (message.interviewComplete) {
+        viewInsightsBtn.style.display = 'inline-block';
+        viewInsightsBtn.onclick = () => {
+            window.location.href = `/insights.html?interview=${interviewId}`;
+        };
+    }
+}
+
 /**
  * Send audio data to server
  */
@@ -196,9 +228,6 @@ async function sendAudio() {
     isRecording = false;
     showLoading();
     
-    // Get audio data as base64
-    const audioBase64 = await getRecordedAudioBase64();
-    
     // Get transcript from speech recognition
     const transcript = getTranscription();
     console.log("Raw transcription:", transcript);
@@ -230,10 +259,11 @@ async function sendAudio() {
     
     // Check if the WebSocket is connected
     if (websocket && websocket.readyState === WebSocket.OPEN) {
-        // Send as audio with transcription
+        // Send as audio with transcription; the recording itself stays local
+        // because the server only needs to know that one exists
         const messageData = {
             type: 'audio',
-            content: audioBase64 || "", 
+            hasAudio: hasRecordedAudio(),
             transcription: transcript,
             voiceStyle: voiceStyle
         };